@@ -2,23 +2,60 @@ import re
 import os
 import argparse
 import json
-import tzlocal
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google.auth.exceptions import RefreshError
+import functools
 import time
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime, timedelta, timezone
 import tempfile
 import subprocess
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 
 
+# The Google client libraries and tzlocal are slow to import, so they
+# are imported inside the functions that use them. This keeps short
+# invocations such as `--help` fast.
+
 # Scope for access to the calendar
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Org heading (task name) and CLOCK line patterns
+_TASK_RE = re.compile(r'^\*+\s+(.*)', re.MULTILINE)
+_CLOCK_RE = re.compile(r'CLOCK: \[(.*?)\]--\[(.*?)\]')
+
+# CLOCK events of a task separated by at most this gap are merged
+CLOCK_MERGE_GAP = timedelta(minutes=1)
+
+# Credentials expiring within this margin are refreshed in the
+# background, checked every `REFRESH_INTERVAL` seconds
+REFRESH_MARGIN = timedelta(minutes=5)
+REFRESH_INTERVAL = 60
+
+# Held while refreshing the credentials and while executing API calls
+_creds_lock = threading.Lock()
+
+# Interactive sessions resumed within this gap after a pause are
+# merged into a single event
+MERGE_GAP = timedelta(seconds=30)
+
+# Maximum number of calls Google accepts in a single batch request
+BATCH_SIZE = 50
+
+
+@functools.lru_cache(maxsize=1)
+def _auth_request():
+    from google.auth.transport.requests import Request
+
+    # A single transport keeps its connection pool across refreshes
+    return Request()
+
 
 def load_credentials(credentials_file, token_file):
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.oauth2.credentials import Credentials
+    from google.auth.exceptions import RefreshError
+
     def new_creds():
         flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
         creds = flow.run_local_server(port=0)
@@ -30,47 +67,211 @@ def load_credentials(credentials_file, token_file):
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             try:
-                creds.refresh(Request())
+                creds.refresh(_auth_request())
             except RefreshError:
                 creds = new_creds()
         else:
             creds = new_creds()
-        with open(token_file, 'w') as token:
-            token.write(creds.to_json())
+        _save_token(creds, token_file)
     return creds
 
 
-def create_calendar_event(
-    service, calendar_id, start_time, end_time, summary='Work session', color_id='7'
-):
-    if (end_time - start_time).seconds < 10:
-        print('Event too short, skipping.')
-        return
+def _save_token(creds, token_file):
+    # Write to a temporary file and rename it over the token file, so
+    # that a crash never leaves a partially written token behind
+    fd, tmp_file = tempfile.mkstemp(
+        dir=os.path.dirname(token_file), suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'w') as token:
+            token.write(creds.to_json())
+            token.flush()
+            os.fsync(token.fileno())
+        os.replace(tmp_file, token_file)
+    except Exception:
+        os.remove(tmp_file)
+        raise
+
+
+def _refresh_loop(creds, token_file):
+    from google.auth.exceptions import GoogleAuthError
+
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        if not creds.expiry or not creds.refresh_token:
+            continue
+        # `creds.expiry` is a naive datetime in UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if creds.expiry - now >= REFRESH_MARGIN:
+            continue
+        with _creds_lock:
+            try:
+                creds.refresh(_auth_request())
+            except GoogleAuthError as e:
+                print(f'Error refreshing credentials: {e}')
+                continue
+            try:
+                _save_token(creds, token_file)
+            except OSError as e:
+                print(f'Error saving refreshed token: {e}')
+
+
+def start_credentials_refresh(creds, token_file):
+    """
+    Keeps the credentials fresh from a background thread.
+
+    Refreshing ahead of expiry keeps the token refresh round trip out
+    of the API calls made later in a long session.
+
+    Parameters
+    ----------
+    creds : google.oauth2.credentials.Credentials
+        The credentials to keep fresh.
+    token_file : str
+        Path where refreshed tokens are saved.
+
+    Returns
+    -------
+    threading.Thread
+        The daemon thread running the refresh loop.
+    """
+    thread = threading.Thread(
+        target=_refresh_loop, args=(creds, token_file), daemon=True
+    )
+    thread.start()
+    return thread
 
-    event = {
+
+@functools.lru_cache(maxsize=1)
+def _local_tz():
+    import tzlocal
+
+    return tzlocal.get_localzone().key
+
+
+def _is_too_short(start_time, end_time):
+    return (end_time - start_time).total_seconds() < 10
+
+
+def _build_event_body(start_time, end_time, summary='Work session', color_id='7'):
+    local_tz = _local_tz()
+    return {
         'summary': summary,
         'start': {
             'dateTime': start_time.isoformat(),
-            'timeZone': tzlocal.get_localzone().key,
+            'timeZone': local_tz,
         },
         'end': {
             'dateTime': end_time.isoformat(),
-            'timeZone': tzlocal.get_localzone().key,
+            'timeZone': local_tz,
         },
         'colorId': color_id,
     }
-    event = service.events().insert(calendarId=calendar_id, body=event).execute()
+
+
+def _on_done(request_id, response, exception):
+    if exception is not None:
+        print(f'Error creating event: {exception}')
+        return
+    print(f'Event created: {response.get("htmlLink")}')
+
+
+def create_calendar_event(
+    service, calendar_id, start_time, end_time, summary='Work session', color_id='7'
+):
+    if _is_too_short(start_time, end_time):
+        print('Event too short, skipping.')
+        return
+
+    event = _build_event_body(start_time, end_time, summary, color_id)
+    with _creds_lock:
+        event = (
+            service.events()
+            .insert(calendarId=calendar_id, body=event, fields='htmlLink')
+            .execute()
+        )
     print(f'Event created: {event.get("htmlLink")}')
 
 
+def _execute_batched(service, requests, callback):
+    requests = iter(requests)
+    while True:
+        chunk = list(islice(requests, BATCH_SIZE))
+        if not chunk:
+            break
+        batch = service.new_batch_http_request(callback=callback)
+        for request in chunk:
+            batch.add(request)
+        with _creds_lock:
+            batch.execute()
+
+
+def insert_events(service, calendar_id, bodies):
+    """
+    Inserts events using batch requests.
+
+    Groups the inserts into multipart batch requests of at most
+    `BATCH_SIZE` calls each, so that many events cost a single round
+    trip instead of one per event.
+
+    Parameters
+    ----------
+    service : googleapiclient.discovery.Resource
+        The authenticated Google Calendar service.
+    calendar_id : str
+        The ID of the Google Calendar to add events to.
+    bodies : iterable of dict
+        The event bodies to insert.
+
+    Returns
+    -------
+    int
+        The number of events that could not be created.
+    """
+    failures = []
+
+    def on_done(request_id, response, exception):
+        _on_done(request_id, response, exception)
+        if exception is not None:
+            failures.append(exception)
+
+    # `service.events()` builds a new resource object on each call
+    events = service.events()
+    _execute_batched(
+        service,
+        (
+            events.insert(calendarId=calendar_id, body=body, fields='htmlLink')
+            for body in bodies
+        ),
+        on_done,
+    )
+    return len(failures)
+
+
+def _clock_event_bodies(clock_events, task_name):
+    for event in clock_events:
+        if _is_too_short(event['start'], event['end']):
+            print('Event too short, skipping.')
+            continue
+        yield _build_event_body(event['start'], event['end'], summary=task_name)
+
+
+@functools.lru_cache(maxsize=1)
 def get_config_path():
     home_dir = os.path.expanduser('~')
     config_dir = os.path.join(home_dir, '.config', 'CalTrack')
-    if not os.path.exists(config_dir):
+    if not os.path.isdir(config_dir):
         os.makedirs(config_dir, exist_ok=True)
     return config_dir
 
 
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    config_file = os.path.join(get_config_path(), 'config.json')
+    with open(config_file, 'r') as file:
+        return json.load(file)
+
+
 def add_text(service, calendar_id):
     """
     Opens a text editor to input a log entry, parses it, and creates calendar events.
@@ -82,31 +283,41 @@ def add_text(service, calendar_id):
     calendar_id : str
         The ID of the Google Calendar to add events to.
     """
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as temp_file:
-        temp_file_path = temp_file.name
+    fd, temp_file_path = tempfile.mkstemp(suffix='.org')
+    os.close(fd)
 
-    # Open the text editor
-    editor = os.getenv(
-        'EDITOR', 'nano'
-    )  # Use $EDITOR environment variable or default to 'nano'
     try:
-        subprocess.call(f'{editor} {temp_file_path}', shell=True)
-    except Exception as e:
-        print(f'Error opening editor: {e}')
-        os.remove(temp_file_path)
-        return
-
-    # Read the text from the file
-    try:
-        with open(temp_file_path, 'r') as temp_file:
-            text = temp_file.read()
-    except Exception as e:
-        print(f'Error reading temporary file: {e}')
-        os.remove(temp_file_path)
-        return
+        # Open the text editor
+        editor = os.getenv(
+            'EDITOR', 'nano'
+        )  # Use $EDITOR environment variable or default to 'nano'
+        if os.name == 'nt':
+            # Let cmd.exe resolve quoted paths and .cmd/.bat shims
+            editor_cmd = f'{editor} {subprocess.list2cmdline([temp_file_path])}'
+            shell = True
+        elif os.path.isfile(editor):
+            # A bare path, possibly containing spaces
+            editor_cmd = [editor, temp_file_path]
+            shell = False
+        else:
+            editor_cmd = shlex.split(editor) + [temp_file_path]
+            shell = False
+        try:
+            subprocess.run(editor_cmd, shell=shell, check=False)
+        except Exception as e:
+            print(f'Error opening editor: {e}')
+            return
 
-    # Delete the temporary file
-    os.remove(temp_file_path)
+        # Read the text from the file
+        try:
+            with open(temp_file_path, 'rb') as temp_file:
+                text = temp_file.read().decode('utf-8')
+        except Exception as e:
+            print(f'Error reading temporary file: {e}')
+            return
+    finally:
+        # Delete the temporary file
+        os.unlink(temp_file_path)
 
     # Parse the log entry
     try:
@@ -118,36 +329,58 @@ def add_text(service, calendar_id):
         return
 
     # Create calendar events
-    for event in clock_events:
-        create_calendar_event(
-            service, calendar_id, event['start'], event['end'], summary=task_name
-        )
+    failures = insert_events(
+        service, calendar_id, _clock_event_bodies(clock_events, task_name)
+    )
+    if failures:
+        print(f'{failures} event(s) could not be created for task: {task_name}')
+        return
     print(f'Events created successfully for task: {task_name}')
 
 
 def rename_events(service, calendar_id, start_date, end_date, old_name, new_name):
-    events_result = (
-        service.events()
-        .list(
+    # Recurring events are listed once (not expanded into instances), so
+    # renaming one renames the whole series. The `q` filter is applied
+    # server-side, the exact summary match below still applies.
+    events_resource = service.events()
+    events = []
+    page_token = None
+    while True:
+        request = events_resource.list(
             calendarId=calendar_id,
             timeMin=start_date.isoformat(),
             timeMax=end_date.isoformat(),
-            singleEvents=True,
-            orderBy='startTime',
+            q=old_name,
+            pageToken=page_token,
+            fields='items(id,summary),nextPageToken',
         )
-        .execute()
-    )
-    events = events_result.get('items', [])
+        with _creds_lock:
+            events_result = request.execute()
+        events.extend(events_result.get('items', []))
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            break
+
+    def on_updated(request_id, response, exception):
+        if exception is not None:
+            print(f'Error updating event: {exception}')
+            return
+        print(f'Updated event: {response.get("htmlLink")}')
 
+    updates = []
     for event in events:
         if event.get('summary') == old_name:
-            event['summary'] = new_name
-            updated_event = (
-                service.events()
-                .update(calendarId=calendar_id, eventId=event['id'], body=event)
-                .execute()
+            # Only the summary was fetched, so patch it rather than
+            # replacing the whole event
+            updates.append(
+                events_resource.patch(
+                    calendarId=calendar_id,
+                    eventId=event['id'],
+                    body={'summary': new_name},
+                    fields='htmlLink',
+                )
             )
-            print(f'Updated event: {updated_event.get("htmlLink")}')
+    _execute_batched(service, updates, on_updated)
 
     # # Example usage:
     # # Define your time window
@@ -163,6 +396,21 @@ def rename_events(service, calendar_id, start_date, end_date, old_name, new_name
     # rename_events(service, calendar_id, start_date, end_date, old_name, new_name)
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_org_ts(timestamp):
+    # Org timestamps look like `2024-11-20 Wed 12:48`. The weekday is
+    # implied by the date, and its abbreviation depends on the locale,
+    # so the time is read from the end of the string. Consecutive CLOCK
+    # lines usually share a timestamp, hence the cache.
+    return datetime(
+        int(timestamp[0:4]),
+        int(timestamp[5:7]),
+        int(timestamp[8:10]),
+        int(timestamp[-5:-3]),
+        int(timestamp[-2:]),
+    )
+
+
 def parse_org_log(log_entry):
     """
     Parses an Org task entry with CLOCK events.
@@ -178,24 +426,99 @@ def parse_org_log(log_entry):
         A dictionary containing the task name and a list of CLOCK events
         with their start and end times as datetime objects.
     """
-    # Match the task name after one or more asterisks
-    task_name_match = re.search(r'^\*+\s+(.*)', log_entry, re.MULTILINE)
-    if not task_name_match:
+    return _parse_org_lines(log_entry.splitlines())
+
+
+def _parse_org_lines(lines):
+    # Like `parse_org_log`, but reads the entry line by line
+    lines = iter(lines)
+    head = []
+    task_name = None
+    for line in lines:
+        head.append(line)
+        # Match the task name after one or more asterisks
+        task_name_match = _TASK_RE.match(line)
+        if task_name_match:
+            task_name = task_name_match.group(1).strip()
+            break
+    if task_name is None:
         raise ValueError('Task name not found in log entry.')
-    task_name = task_name_match.group(1).strip()
 
-    # Match each CLOCK line and extract the start and end timestamps
-    clock_pattern = re.compile(r'CLOCK: \[(.*?)\]--\[(.*?)\]')
-    clock_matches = clock_pattern.findall(log_entry)
+    clock_events = [
+        event for _, event in iter_parse_org_log(chain(head, lines))
+    ]
+
+    return {'task_name': task_name, 'clock_events': clock_events}
+
+
+def merge_clock_events(clock_events, gap=CLOCK_MERGE_GAP):
+    """
+    Merges overlapping or adjacent CLOCK events.
+
+    Parameters
+    ----------
+    clock_events : list of dict
+        CLOCK events with their start and end times.
+    gap : datetime.timedelta
+        Events starting at most this long after the end of the previous
+        one are merged into it.
+
+    Returns
+    -------
+    list of dict
+        The merged events, sorted by start time.
+    """
+    merged = []
+    for event in sorted(clock_events, key=lambda e: e['start']):
+        if merged and event['start'] - merged[-1]['end'] <= gap:
+            merged[-1]['end'] = max(merged[-1]['end'], event['end'])
+        else:
+            merged.append(dict(event))
+    return merged
+
+
+def iter_parse_org_log(lines):
+    """
+    Parses Org entries with CLOCK events line by line.
+
+    The CLOCK events of each task are merged with
+    `merge_clock_events` before being yielded. CLOCK events found
+    before the first heading are attributed to that heading.
 
-    # Parse the timestamps into datetime objects
+    Parameters
+    ----------
+    lines : iterable of str
+        The lines of the log, e.g. an open file.
+
+    Yields
+    ------
+    tuple
+        The name of the task the CLOCK event is under, and a dictionary
+        with its start and end times as datetime objects.
+    """
+    task_name = None
     clock_events = []
-    for start, end in clock_matches:
-        start_dt = datetime.strptime(start, '%Y-%m-%d %a %H:%M')
-        end_dt = datetime.strptime(end, '%Y-%m-%d %a %H:%M')
-        clock_events.append({'start': start_dt, 'end': end_dt})
+    for line in lines:
+        # Match the task name after one or more asterisks
+        task_name_match = _TASK_RE.match(line)
+        if task_name_match:
+            if task_name is not None:
+                for event in merge_clock_events(clock_events):
+                    yield task_name, event
+                clock_events = []
+            task_name = task_name_match.group(1).strip()
+            continue
+
+        # Match each CLOCK line and extract the start and end timestamps
+        for start, end in _CLOCK_RE.findall(line):
+            clock_events.append(
+                {'start': _parse_org_ts(start), 'end': _parse_org_ts(end)}
+            )
 
-    return {'task_name': task_name, 'clock_events': clock_events}
+    if task_name is None and clock_events:
+        raise ValueError('Task name not found in log entry.')
+    for event in merge_clock_events(clock_events):
+        yield task_name, event
 
 
 def create_events_from_log(log_entry, service, calendar_id):
@@ -211,16 +534,20 @@ def create_events_from_log(log_entry, service, calendar_id):
     calendar_id : str
         The ID of the Google Calendar to add events to.
     """
-    # Parse the log entry
-    parsed_log = parse_org_log(log_entry)
+    _create_events_from_lines(log_entry.splitlines(), service, calendar_id)
+
+
+def _create_events_from_lines(lines, service, calendar_id):
+    # Parse the whole log entry before creating any event, so that a
+    # malformed entry does not leave it partially imported
+    parsed_log = _parse_org_lines(lines)
     task_name = parsed_log['task_name']
     clock_events = parsed_log['clock_events']
 
     # Create events in Google Calendar
-    for event in clock_events:
-        create_calendar_event(
-            service, calendar_id, event['start'], event['end'], summary=task_name
-        )
+    return insert_events(
+        service, calendar_id, _clock_event_bodies(clock_events, task_name)
+    )
 
 
 def create_default_sleep_events(service, calendar_id):
@@ -238,21 +565,130 @@ def create_default_sleep_events(service, calendar_id):
         The ID of the Google Calendar to add events to.
     """
     now = datetime.now()
-    create_calendar_event(
+    midnight = datetime(now.year, now.month, now.day, 0, 0, 0)
+    insert_events(
         service,
         calendar_id,
-        datetime(now.year, now.month, now.day, 0, 0, 0),
-        datetime(now.year, now.month, now.day, 4, 0, 0),
-        summary='Sleep',
-        color_id=None,
+        [
+            _build_event_body(
+                midnight,
+                datetime(now.year, now.month, now.day, 4, 0, 0),
+                summary='Sleep',
+                color_id=None,
+            ),
+            _build_event_body(
+                datetime(now.year, now.month, now.day, 21, 0, 0) - timedelta(days=1),
+                midnight,
+                summary='Sleep',
+                color_id=None,
+            ),
+        ],
     )
-    create_calendar_event(
-        service,
-        calendar_id,
-        datetime(now.year, now.month, now.day, 21, 0, 0) - timedelta(days=1),
-        datetime(now.year, now.month, now.day, 0, 0, 0),
-        summary='Sleep',
-        color_id=None,
+
+
+def _run_interactive(service, calendar_id, event_name):
+    print('Current time:', datetime.now().strftime('%H:%M:%S'))
+    print('Press Enter to start working and to pause/resume.')
+    print("Type 'exit' and press Enter to quit.")
+
+    # API calls run on a worker thread so that the prompt never waits
+    # on the network
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    def create_event(start_time, end_time):
+        try:
+            create_calendar_event(
+                service, calendar_id, start_time, end_time, summary=event_name
+            )
+        except Exception as e:
+            print(f'Error creating event: {e}')
+
+    def submit_event(start_time, end_time):
+        executor.submit(create_event, start_time, end_time)
+
+    # A paused session is held back for `MERGE_GAP`, in case work is
+    # resumed and it can be extended instead of creating a new event
+    paused_session = None
+    paused_lock = threading.Lock()
+    flush_timer = None
+
+    def flush():
+        nonlocal paused_session
+        with paused_lock:
+            if paused_session:
+                submit_event(*paused_session)
+                paused_session = None
+
+    def pause(start_time, end_time):
+        nonlocal paused_session, flush_timer
+        with paused_lock:
+            paused_session = (start_time, end_time)
+        flush_timer = threading.Timer(MERGE_GAP.total_seconds(), flush)
+        flush_timer.daemon = True
+        flush_timer.start()
+
+    def resume(now):
+        nonlocal paused_session
+        if flush_timer:
+            flush_timer.cancel()
+        with paused_lock:
+            if paused_session and now - paused_session[1] <= MERGE_GAP:
+                start_time = paused_session[0]
+                paused_session = None
+                return start_time
+        flush()
+        return now
+
+    total_time = 0.0
+    working = False
+    # The work time is measured with a monotonic clock, immune to
+    # wall-clock adjustments. Wall-clock times are only used for events.
+    start_mono = None
+    # Start of the event, earlier than the start of this stretch of
+    # work when a paused session was resumed within `MERGE_GAP`
+    event_start = None
+
+    try:
+        while True:
+            try:
+                user_input = input()
+                if user_input.lower() == 'exit':
+                    if working:
+                        end_time = datetime.now()
+                        total_time += time.monotonic() - start_mono
+                        submit_event(event_start, end_time)
+                    break
+            except (EOFError, KeyboardInterrupt):
+                print('\nCtrl-D detected, exiting...')
+                if working:
+                    end_time = datetime.now()
+                    total_time += time.monotonic() - start_mono
+                    submit_event(event_start, end_time)
+                break
+
+            if working:
+                end_time = datetime.now()
+                total_time += time.monotonic() - start_mono
+                pause(event_start, end_time)
+                working = False
+                print('Work paused. Press Enter to resume.')
+            else:
+                start_mono = time.monotonic()
+                event_start = resume(datetime.now())
+                working = True
+                print('Working... Press Enter to pause.')
+    finally:
+        # Wait for pending events to be created
+        if flush_timer:
+            flush_timer.cancel()
+        flush()
+        executor.shutdown(wait=True)
+
+    hours, remainder = divmod(total_time, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    print(
+        f'Total work time in this session: '
+        f'{int(hours):02}:{int(minutes):02}:{int(seconds):02}'
     )
 
 
@@ -284,12 +720,12 @@ def main():
     config_path = get_config_path()
     credentials_file = os.path.join(config_path, 'credentials.json')
     token_file = os.path.join(config_path, 'token.json')
-    config_file = os.path.join(config_path, 'config.json')
 
-    with open(config_file, 'r') as file:
-        config = json.load(file)
-    calendar_id = config.get('calendar_id')
+    calendar_id = _load_config().get('calendar_id')
     creds = load_credentials(credentials_file, token_file)
+    start_credentials_refresh(creds, token_file)
+    from googleapiclient.discovery import build
+
     service = build('calendar', 'v3', credentials=creds)
 
     # Handle '--add' option
@@ -301,8 +737,7 @@ def main():
     if args.log:
         try:
             with open(args.log, 'r') as log_file:
-                log_entry = log_file.read()
-            create_events_from_log(log_entry, service, calendar_id)
+                _create_events_from_lines(log_file, service, calendar_id)
         except Exception as e:
             print(f'Error processing log file: {e}')
         return
@@ -318,58 +753,7 @@ def main():
     else:
         event_name = input('Enter the name of the event: ')
 
-    print('Current time:', datetime.now().strftime('%H:%M:%S'))
-    print('Press Enter to start working and to pause/resume.')
-    print("Type 'exit' and press Enter to quit.")
-
-    total_time = 0.0
-    working = False
-    start_time = None
-
-    while True:
-        try:
-            user_input = input()
-            if user_input.lower() == 'exit':
-                if working:
-                    end_time = datetime.now()
-                    total_time += (end_time - start_time).total_seconds()
-                    create_calendar_event(
-                        service,
-                        calendar_id,
-                        start_time,
-                        end_time,
-                        summary=event_name,
-                    )
-                break
-        except (EOFError, KeyboardInterrupt):
-            print('\nCtrl-D detected, exiting...')
-            if working:
-                end_time = datetime.now()
-                total_time += (end_time - start_time).total_seconds()
-                create_calendar_event(
-                    service, calendar_id, start_time, end_time, summary=event_name
-                )
-            break
-
-        if working:
-            end_time = datetime.now()
-            total_time += (end_time - start_time).total_seconds()
-            create_calendar_event(
-                service, calendar_id, start_time, end_time, summary=event_name
-            )
-            working = False
-            print('Work paused. Press Enter to resume.')
-        else:
-            start_time = datetime.now()
-            working = True
-            print('Working... Press Enter to pause.')
-
-    hours, remainder = divmod(total_time, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    print(
-        f'Total work time in this session: '
-        f'{int(hours):02}:{int(minutes):02}:{int(seconds):02}'
-    )
+    _run_interactive(service, calendar_id, event_name)
 
 
 if __name__ == '__main__':